@@ -1,6 +1,10 @@
 import os
 import sys
+import json
+import time
 import logging
+import threading
+from dataclasses import dataclass, is_dataclass, asdict
 from datetime import datetime, date
 from flask import (
     Flask,
@@ -11,6 +15,9 @@ from flask import (
     flash,
     redirect,
     url_for,
+    Response,
+    stream_template,
+    stream_with_context,
 )
 import tempfile
 from werkzeug.utils import secure_filename
@@ -35,6 +42,29 @@ try:
 except ImportError:
     HAS_DBFREAD = False
 
+try:
+    import pandas as pd
+
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from flask_compress import Compress
+
+    HAS_FLASK_COMPRESS = True
+except ImportError:
+    HAS_FLASK_COMPRESS = False
+
+from fast_dbf import FastDBF, UnsupportedDbfError
+
 # Try importing other required libraries
 try:
     from reportlab.lib.pagesizes import A4, landscape
@@ -66,20 +96,106 @@ try:
 except ImportError:
     HAS_PIL = False
 
-# Configure logging
+# Configure logging. LOG_LEVEL=DEBUG opts into the per-record diagnostics;
+# LOG_STDOUT=0 drops the console handler under gunicorn, which captures
+# stderr itself.
+_log_handlers = [logging.FileHandler("courier_receipts.log")]
+if os.environ.get("LOG_STDOUT", "1") != "0":
+    _log_handlers.append(logging.StreamHandler(sys.stdout))
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("courier_receipts.log"),
-        logging.StreamHandler(sys.stdout),
-    ],
+    handlers=_log_handlers,
 )
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.secret_key = "your-secret-key-change-this"
 
+# Gzip JSON/HTML responses when Flask-Compress is installed - the party
+# list and large docket ranges compress well
+if HAS_FLASK_COMPRESS:
+    Compress(app)
+
+
+# Row records use slots dataclasses instead of dicts: ~3x less memory per
+# row, which matters because parties and recent query results stay cached
+# in-process, and attribute access is faster in the hot loops. slots=True
+# needs Python 3.10+; the 3.8/3.9 interpreters the install docs allow fall
+# back to ordinary dict-backed dataclasses.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class Party:
+    code: str
+    name: str
+    city: str
+    phone: str
+    mobile: str
+    adr1: str
+    adr2: str
+    adr3: str
+
+
+@dataclass(**_SLOTS)
+class Docket:
+    docket_no: str
+    date: date
+    party_code: str
+    origin: str
+    destination: str
+    ref_no: str
+    weight: float
+    amount: float
+    party_name: str
+
+
+@dataclass(**_SLOTS)
+class EnhancedDocket:
+    docket_no: str
+    date: str
+    origin: str
+    destination: str
+    consignor: str
+    consignee: str
+    ref_no: str
+    weight: float
+    amount: float
+
+
+def _s(value, encoding="ascii"):
+    """Decode and strip one raw DBF field value.
+
+    Returns '' for None/blank instead of the four-character string 'None'
+    that the old str(record.get(...)).strip() idiom produced.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode(encoding, "replace").strip()
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _json_default(obj):
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj):
+    """Serialize one object to JSON bytes, preferring orjson when installed"""
+    if HAS_ORJSON:
+        # OPT_SERIALIZE_NUMPY covers the numpy scalars pandas emits;
+        # dataclasses are handled natively
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode("utf-8")
+
+
+def ojsonify(obj, status=200):
+    """jsonify replacement that serializes with orjson when available"""
+    return Response(_json_dumps(obj), status=status, mimetype="application/json")
+
 
 def check_dependencies():
     """Check if all required dependencies are available"""
@@ -97,6 +213,64 @@ def check_dependencies():
     return missing
 
 
+# Winning encodings are remembered on disk (keyed by absolute path and
+# mtime) so a restarted server skips the probe loop entirely for files
+# that have not changed.
+_ENCODING_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".courier_receipts", "encoding_cache.json"
+)
+_encoding_cache = None
+
+
+def _get_cached_encoding(file_path, mtime):
+    global _encoding_cache
+    if _encoding_cache is None:
+        try:
+            with open(_ENCODING_CACHE_FILE) as f:
+                _encoding_cache = json.load(f)
+        except (OSError, ValueError):
+            _encoding_cache = {}
+    entry = _encoding_cache.get(os.path.abspath(file_path))
+    if entry and entry[0] == mtime:
+        return entry[1]
+    return None
+
+
+def _store_cached_encoding(file_path, mtime, encoding):
+    _encoding_cache[os.path.abspath(file_path)] = [mtime, encoding]
+    try:
+        os.makedirs(os.path.dirname(_ENCODING_CACHE_FILE), exist_ok=True)
+        with open(_ENCODING_CACHE_FILE, "w") as f:
+            json.dump(_encoding_cache, f)
+    except OSError as e:
+        logger.debug("Could not persist encoding cache: %s", e)
+
+
+# In-process cache of parsed DBF data keyed by file path (plus an optional
+# tag for derived views like the code->party map). Entries are invalidated
+# whenever the file's mtime changes, so edits made in FoxPro show up on the
+# next request without restarting the server.
+_dbf_cache = {}
+_dbf_cache_lock = threading.RLock()
+
+
+def _load_cached(path, parser, key=None):
+    """Return parser(path), memoized on the file's st_mtime_ns.
+
+    The lock makes this safe under Flask's threaded server; RLock because
+    derived parsers (e.g. the parties map) call back into cached loaders.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cache_key = key or path
+    with _dbf_cache_lock:
+        entry = _dbf_cache.get(cache_key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        result = parser(path)
+        _dbf_cache[cache_key] = (mtime, result)
+        return result
+
+
 class DatabaseManager:
     def __init__(self, dlchln_path=None, prtmst_path=None):
         self.dlchln_path = dlchln_path or "DLCHLN.DBF"
@@ -113,23 +287,73 @@ class DatabaseManager:
         ]
 
     def read_dbf_with_encoding(self, file_path):
-        """Try to read DBF file with different encodings"""
+        """Find a working encoding for a DBF file and return it.
+
+        Only probes the first record instead of materializing the whole
+        table - callers open the file exactly once with the returned
+        encoding. Winners are persisted per path+mtime so later runs skip
+        the probe altogether.
+        """
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if mtime is not None:
+            cached = _get_cached_encoding(file_path, mtime)
+            if cached is not None:
+                return cached
+
         for encoding in self.encodings:
             try:
-                logger.info(f"Trying to read {file_path} with encoding: {encoding}")
+                logger.info("Trying to read %s with encoding: %s", file_path, encoding)
                 dbf = DBF(file_path, encoding=encoding)
-                # Test reading by getting first record
-                test_records = list(dbf)
-                logger.info(
-                    f"Successfully read {file_path} with encoding: {encoding}, records: {len(test_records)}"
-                )
-                return dbf, encoding
+                # Test decoding by reading the first record only
+                next(iter(dbf), None)
+                logger.info("Successfully probed %s with encoding: %s", file_path, encoding)
+                if mtime is not None:
+                    _store_cached_encoding(file_path, mtime, encoding)
+                return encoding
             except Exception as e:
-                logger.debug(f"Failed to read with {encoding}: {str(e)}")
+                logger.debug("Failed to read with %s: %s", encoding, e)
                 continue
 
         raise Exception(f"Could not read {file_path} with any supported encoding")
 
+    def _iter_raw_records(self, file_path, encoding, fields=None):
+        """Iterate raw byte records, slicing only the requested fields.
+
+        Prefers the mmap-backed fast_dbf reader; falls back to dbfread in
+        raw mode if the header version is not recognized.
+        """
+        try:
+            return FastDBF(file_path).records(fields)
+        except UnsupportedDbfError as e:
+            logger.info("fast_dbf cannot read %s (%s), using dbfread", file_path, e)
+            return iter(
+                DBF(
+                    file_path,
+                    encoding=encoding,
+                    raw=True,
+                    recfactory=dict,
+                    lowernames=False,
+                )
+            )
+
+    def _count_records(self, file_path, encoding):
+        """Count undeleted records without decoding any fields"""
+        try:
+            # fields=() slices nothing per record - only the deletion flag
+            # of each record is ever touched
+            return sum(1 for _ in FastDBF(file_path).records(fields=()))
+        except UnsupportedDbfError:
+            return sum(
+                1
+                for _ in DBF(
+                    file_path, encoding=encoding, raw=True, recfactory=dict
+                )
+            )
+
     def test_connection(self):
         """Test if DBF files exist and are readable"""
         if not HAS_DBFREAD:
@@ -143,164 +367,409 @@ class DatabaseManager:
                 raise FileNotFoundError(f"PRTMST.DBF not found at {self.prtmst_path}")
 
             # Test reading with proper encoding
-            dlchln, dlchln_encoding = self.read_dbf_with_encoding(self.dlchln_path)
-            prtmst, prtmst_encoding = self.read_dbf_with_encoding(self.prtmst_path)
+            dlchln_encoding = self.read_dbf_with_encoding(self.dlchln_path)
+            prtmst_encoding = self.read_dbf_with_encoding(self.prtmst_path)
 
-            dlchln_count = len(list(dlchln))
-            prtmst_count = len(list(prtmst))
+            dlchln_count = self._count_records(self.dlchln_path, dlchln_encoding)
+            prtmst_count = self._count_records(self.prtmst_path, prtmst_encoding)
 
-            logger.info(f"Successfully connected to DBF files")
-            logger.info(f"DLCHLN records: {dlchln_count} (encoding: {dlchln_encoding})")
-            logger.info(f"PRTMST records: {prtmst_count} (encoding: {prtmst_encoding})")
+            logger.info("Successfully connected to DBF files")
+            logger.info("DLCHLN records: %s (encoding: %s)", dlchln_count, dlchln_encoding)
+            logger.info("PRTMST records: %s (encoding: %s)", prtmst_count, prtmst_encoding)
 
             return True
         except Exception as e:
-            logger.error(f"Database connection failed: {str(e)}")
+            logger.error("Database connection failed: %s", e)
             return False
 
     def get_parties(self):
-        """Get all parties from PRTMST.DBF"""
+        """Get all parties from PRTMST.DBF (cached until the file changes)"""
         if not HAS_DBFREAD:
             logger.error("dbfread library not available")
             return []
 
         try:
-            logger.info("Starting to load parties...")
-            prtmst, encoding = self.read_dbf_with_encoding(self.prtmst_path)
-            parties = []
-
-            # Read DBF again for actual processing
-            prtmst = DBF(self.prtmst_path, encoding=encoding)
-
-            for i, record in enumerate(prtmst):
-                try:
-                    # Use correct field names from your database
-                    name = record.get("PRTNM")  # Party Name
-                    code = record.get("PRTCD")  # Party Code
-
-                    # Skip records without name or code
-                    if not name or not code:
-                        continue
-
-                    # Clean up the data
-                    party = {
-                        "code": str(code).strip(),
-                        "name": str(name).strip(),
-                        "city": str(record.get("CITY", "")).strip(),
-                        "phone": str(record.get("PHONE_1", "")).strip(),
-                        "mobile": str(record.get("MOBILE", "")).strip(),
-                        "adr1": str(record.get("ADR1", "")).strip(),
-                        "adr2": str(record.get("ADR2", "")).strip(),
-                        "adr3": str(record.get("ADR3", "")).strip(),
-                    }
-
-                    # Only add if name is not empty after stripping
-                    if party["name"] and party["code"]:
-                        parties.append(party)
-
-                except Exception as e:
-                    logger.warning(f"Error processing party record {i}: {str(e)}")
-                    continue
+            return _load_cached(self.prtmst_path, self._parse_parties)
+        except Exception as e:
+            logger.error("Error retrieving parties: %s", e)
+            return []
+
+    def get_parties_map(self):
+        """Get parties keyed by party code (cached until PRTMST.DBF changes)"""
+        if not HAS_DBFREAD:
+            logger.error("dbfread library not available")
+            return {}
 
-            # Sort by name
-            parties.sort(key=lambda x: x["name"])
-            logger.info(f"Successfully retrieved {len(parties)} parties")
+        try:
+            return _load_cached(
+                self.prtmst_path,
+                lambda path: {p.code: p for p in self.get_parties()},
+                key=(self.prtmst_path, "map"),
+            )
+        except Exception as e:
+            logger.error("Error building parties map: %s", e)
+            return {}
+
+    def get_parties_json(self):
+        """Get the parties list pre-serialized to JSON bytes.
+
+        Cached alongside the parsed list so repeated /api/parties hits skip
+        serialization entirely, not just the parse.
+        """
+        if not HAS_DBFREAD:
+            return _json_dumps([])
+
+        try:
+            return _load_cached(
+                self.prtmst_path,
+                lambda path: _json_dumps(self.get_parties()),
+                key=(self.prtmst_path, "json"),
+            )
+        except Exception as e:
+            logger.error("Error serializing parties: %s", e)
+            return _json_dumps([])
 
-            return parties
+    def get_consignor_names(self):
+        """Get the party code -> name dict used by the fused docket join"""
+        if not HAS_DBFREAD:
+            return {}
 
+        try:
+            return _load_cached(
+                self.prtmst_path,
+                lambda path: {
+                    code: party.name for code, party in self.get_parties_map().items()
+                },
+                key=(self.prtmst_path, "consignor_names"),
+            )
         except Exception as e:
-            logger.error(f"Error retrieving parties: {str(e)}")
+            logger.error("Error building consignor names: %s", e)
+            return {}
+
+    def _parse_parties(self, path):
+        """Parse all parties from PRTMST.DBF"""
+        logger.info("Starting to load parties...")
+        encoding = self.read_dbf_with_encoding(path)
+        parties = []
+
+        # Raw records with only the fields we use sliced out of ~55 columns;
+        # decoding happens below
+        prtmst = self._iter_raw_records(path, encoding, tuple(self._PARTY_COLUMNS))
+
+        if HAS_PANDAS:
+            return self._parse_parties_vectorized(prtmst, encoding)
+
+        for i, record in enumerate(prtmst):
+            try:
+                # Use correct field names from your database
+                name = _s(record["PRTNM"], encoding)
+                code = _s(record["PRTCD"], encoding)
+
+                # Skip records without name or code
+                if not name or not code:
+                    continue
+
+                parties.append(
+                    Party(
+                        code=code,
+                        name=name,
+                        city=_s(record["CITY"], encoding),
+                        phone=_s(record["PHONE_1"], encoding),
+                        mobile=_s(record["MOBILE"], encoding),
+                        adr1=_s(record["ADR1"], encoding),
+                        adr2=_s(record["ADR2"], encoding),
+                        adr3=_s(record["ADR3"], encoding),
+                    )
+                )
+
+            except Exception as e:
+                # debug, not warning: formatting and I/O per malformed row
+                # would sit inside the hot parse loop
+                logger.debug("Error processing party record %d: %s", i, e)
+                continue
+
+        # Sort by name
+        parties.sort(key=lambda x: x.name)
+        logger.info("Successfully retrieved %s parties", len(parties))
+
+        return parties
+
+    # DLCHLN columns read by get_dockets
+    _DOCKET_COLUMNS = (
+        "DATE",
+        "DOC_NO",
+        "PRTCD",
+        "CITY",
+        "REMARK",
+        "WEIGHT",
+        "AMOUNT",
+        "PARTY",
+    )
+
+    # Mapping of PRTMST column -> key used in the rest of the app
+    _PARTY_COLUMNS = {
+        "PRTCD": "code",
+        "PRTNM": "name",
+        "CITY": "city",
+        "PHONE_1": "phone",
+        "MOBILE": "mobile",
+        "ADR1": "adr1",
+        "ADR2": "adr2",
+        "ADR3": "adr3",
+    }
+
+    def _parse_parties_vectorized(self, prtmst, encoding):
+        """Pandas fast path for _parse_parties: decode/strip in C, not per row"""
+        df = pd.DataFrame(iter(prtmst))
+        if df.empty:
             return []
 
-    def get_dockets(self, start_date, end_date, party_code=None):
-        """Get dockets from DLCHLN.DBF within date range and optionally for specific party"""
+        out = pd.DataFrame(
+            {
+                key: df[col].str.decode(encoding, "replace").str.strip()
+                for col, key in self._PARTY_COLUMNS.items()
+            }
+        )
+
+        # Skip records without name or code
+        out = out[(out["name"] != "") & (out["code"] != "")]
+        out = out.sort_values("name", kind="stable")
+
+        # Column order matches the Party field order
+        parties = [Party(*row) for row in out.itertuples(index=False)]
+        logger.info("Successfully retrieved %s parties", len(parties))
+        return parties
+
+    def get_dockets(self, start_date, end_date, party_code=None, enhance_with=None):
+        """Get dockets from DLCHLN.DBF within date range and optionally for specific party.
+
+        The full file is parsed once per mtime into Docket records; every
+        query (any date range, any party) then filters the cached rows in
+        memory, so only the first request after the DBF changes pays for a
+        file scan. When enhance_with (a party-code -> party map) is given,
+        the filter and party join are fused into one pass and the rows are
+        returned in the final enhanced shape the routes emit.
+        """
         if not HAS_DBFREAD:
             return []
 
         try:
             logger.info(
-                f"Loading dockets from {start_date} to {end_date}, party: {party_code}"
+                "Loading dockets from %s to %s, party: %s",
+                start_date,
+                end_date,
+                party_code,
             )
-            dlchln, encoding = self.read_dbf_with_encoding(self.dlchln_path)
-            dockets = []
+            rows = _load_cached(self.dlchln_path, self._parse_all_dockets)
+
+            code = str(party_code).strip() if party_code is not None else None
+
+            if enhance_with is None:
+                dockets = [
+                    d
+                    for d in rows
+                    if (code is None or d.party_code == code)
+                    and start_date <= d.date <= end_date
+                ]
+                logger.info("Retrieved %s dockets", len(dockets))
+                return dockets
+
+            # Consignor names come from a plain code -> name dict (cached
+            # for the usual case of the shared parties map)
+            if enhance_with is self.get_parties_map():
+                consignor_names = self.get_consignor_names()
+            else:
+                consignor_names = {
+                    code_: party.name for code_, party in enhance_with.items()
+                }
 
-            # Read DBF again for actual processing
-            dlchln = DBF(self.dlchln_path, encoding=encoding)
-
-            for i, record in enumerate(dlchln):
-                try:
-                    record_date = record.get("DATE")
-                    if record_date:
-                        # Convert date if needed
-                        if isinstance(record_date, str):
-                            try:
-                                record_date = datetime.strptime(
-                                    record_date, "%Y-%m-%d"
-                                ).date()
-                            except:
-                                try:
-                                    record_date = datetime.strptime(
-                                        record_date, "%d/%m/%Y"
-                                    ).date()
-                                except:
-                                    try:
-                                        record_date = datetime.strptime(
-                                            record_date, "%m/%d/%Y"
-                                        ).date()
-                                    except:
-                                        continue
-                        elif isinstance(record_date, datetime):
-                            record_date = record_date.date()
-
-                        if start_date <= record_date <= end_date:
-                            # Use PRTCD field from DLCHLN
-                            record_party_code = str(record.get("PRTCD", "")).strip()
-                            if (
-                                party_code is None
-                                or record_party_code == str(party_code).strip()
-                            ):
-                                dockets.append(
-                                    {
-                                        "docket_no": str(
-                                            record.get("DOC_NO", "")
-                                        ).strip(),
-                                        "date": record_date,
-                                        "party_code": record_party_code,
-                                        "origin": "BAVLA",
-                                        "destination": str(
-                                            record.get("CITY", "")
-                                        ).strip(),
-                                        "ref_no": str(record.get("REMARK", "")).strip(),
-                                        "weight": (
-                                            float(record.get("WEIGHT", 0))
-                                            if record.get("WEIGHT")
-                                            else 0
-                                        ),
-                                        "amount": (
-                                            float(record.get("AMOUNT", 0))
-                                            if record.get("AMOUNT")
-                                            else 0
-                                        ),
-                                        "party_name": str(
-                                            record.get("PARTY", "")
-                                        ).strip(),
-                                    }
-                                )
-                except Exception as e:
-                    logger.warning(f"Error processing docket record {i}: {str(e)}")
+            dockets = []
+            for d in rows:
+                if code is not None and d.party_code != code:
                     continue
-
-            logger.info(f"Retrieved {len(dockets)} dockets")
+                if not (start_date <= d.date <= end_date):
+                    continue
+                dockets.append(
+                    EnhancedDocket(
+                        docket_no=d.docket_no,
+                        date=d.date.strftime("%d/%m/%Y"),
+                        origin=d.origin,
+                        destination=d.destination,
+                        consignor=consignor_names.get(d.party_code, ""),
+                        consignee=d.party_name,
+                        ref_no=d.ref_no,
+                        weight=d.weight,
+                        amount=d.amount,
+                    )
+                )
+            logger.info("Retrieved %s dockets", len(dockets))
             return dockets
         except Exception as e:
-            logger.error(f"Error retrieving dockets: {str(e)}")
+            logger.error("Error retrieving dockets: %s", e)
             return []
 
+    def _parse_all_dockets(self, path):
+        """Parse every DLCHLN row into a Docket; runs once per file mtime"""
+        encoding = self.read_dbf_with_encoding(path)
+
+        # Raw records with only the fields we use sliced out of ~55
+        # columns; decoding happens below
+        dlchln = self._iter_raw_records(path, encoding, self._DOCKET_COLUMNS)
+
+        if HAS_PANDAS:
+            return self._parse_all_dockets_vectorized(dlchln, encoding)
+
+        dockets = []
+
+        # Hoisted locals: dockets repeat the same dates constantly, so a
+        # per-call memo avoids re-constructing date objects row by row
+        date_cache = {}
+        _date = date
+
+        for i, record in enumerate(dlchln):
+            try:
+                # D-type fields are stored as YYYYMMDD (blank when unset)
+                raw_date = record["DATE"].strip()
+                if not raw_date:
+                    continue
+                record_date = date_cache.get(raw_date)
+                if record_date is None:
+                    record_date = _date(
+                        int(raw_date[:4]), int(raw_date[4:6]), int(raw_date[6:8])
+                    )
+                    date_cache[raw_date] = record_date
+
+                weight = record["WEIGHT"].strip()
+                amount = record["AMOUNT"].strip()
+                dockets.append(
+                    Docket(
+                        docket_no=_s(record["DOC_NO"], encoding),
+                        date=record_date,
+                        party_code=_s(record["PRTCD"], encoding),
+                        origin="BAVLA",
+                        destination=_s(record["CITY"], encoding),
+                        ref_no=_s(record["REMARK"], encoding),
+                        weight=float(weight) if weight else 0,
+                        amount=float(amount) if amount else 0,
+                        party_name=_s(record["PARTY"], encoding),
+                    )
+                )
+            except Exception as e:
+                # debug, not warning: formatting and I/O per malformed row
+                # would sit inside the hot parse loop
+                logger.debug("Error processing docket record %d: %s", i, e)
+                continue
+
+        return dockets
+
+    def _parse_all_dockets_vectorized(self, dlchln, encoding):
+        """Pandas fast path for _parse_all_dockets: decode/parse with C-level ops"""
+        df = pd.DataFrame(iter(dlchln))
+        if df.empty:
+            return []
+
+        dates = pd.to_datetime(
+            df["DATE"].str.decode("ascii", "replace").str.strip(),
+            format="%Y%m%d",
+            errors="coerce",
+        )
+        sel = df.loc[dates.notna()]
+        if sel.empty:
+            return []
+
+        def text(col):
+            return sel[col].str.decode(encoding, "replace").str.strip()
+
+        def number(col):
+            # astype(float) keeps the dtype float64 even when a column
+            # parses fully integral - matching the loop path's float(...)
+            # and keeping numpy int64 scalars away from the stdlib json
+            # fallback, which cannot serialize them
+            return (
+                pd.to_numeric(
+                    sel[col].str.decode("ascii", "replace").str.strip(),
+                    errors="coerce",
+                )
+                .fillna(0)
+                .astype(float)
+            )
+
+        # Column order matches the Docket field order
+        out = pd.DataFrame(
+            {
+                "docket_no": text("DOC_NO"),
+                "date": dates[dates.notna()].dt.date,
+                "party_code": text("PRTCD"),
+                "origin": "BAVLA",
+                "destination": text("CITY"),
+                "ref_no": text("REMARK"),
+                "weight": number("WEIGHT"),
+                "amount": number("AMOUNT"),
+                "party_name": text("PARTY"),
+            }
+        )
+        return [Docket(*row) for row in out.itertuples(index=False)]
+
 
 # Initialize components
 db_manager = DatabaseManager()
 
 
+def _warm_caches():
+    """Pre-populate the parties caches so the first request hits memory"""
+    try:
+        started = time.perf_counter()
+        db_manager.get_parties()
+        db_manager.get_parties_map()
+        db_manager.get_consignor_names()
+        logger.info(
+            "Warmed PRTMST caches in %.3fs", time.perf_counter() - started
+        )
+    except Exception as e:
+        logger.warning("Cache warm-up failed: %s", e)
+
+
+# Warm in the background at process start (covers both the dev server and
+# gunicorn workers) instead of making the first user request pay the parse
+if HAS_DBFREAD and os.path.exists(db_manager.prtmst_path):
+    threading.Thread(target=_warm_caches, name="cache-warmup", daemon=True).start()
+
+# Cache of fully-enhanced docket lists keyed by query parameters plus the
+# mtimes of both DBF files, so repeat view/print cycles of the same range
+# skip the scan entirely. Bounded: oldest entries are evicted first.
+_enhanced_cache = {}
+_ENHANCED_CACHE_MAX = 32
+
+
+def _get_enhanced_dockets(start_date, end_date, party_code):
+    """Fused, enhanced dockets for a query, cached until either DBF changes"""
+    try:
+        mtimes = (
+            os.stat(db_manager.dlchln_path).st_mtime_ns,
+            os.stat(db_manager.prtmst_path).st_mtime_ns,
+        )
+    except OSError:
+        mtimes = None
+
+    key = (str(start_date), str(end_date), party_code, mtimes)
+    with _dbf_cache_lock:
+        if key in _enhanced_cache:
+            return _enhanced_cache[key]
+
+    parties_map = db_manager.get_parties_map()
+    enhanced = db_manager.get_dockets(
+        start_date, end_date, party_code, enhance_with=parties_map
+    )
+
+    if mtimes is not None:
+        with _dbf_cache_lock:
+            while len(_enhanced_cache) >= _ENHANCED_CACHE_MAX:
+                _enhanced_cache.pop(next(iter(_enhanced_cache)))
+            _enhanced_cache[key] = enhanced
+
+    return enhanced
+
+
 @app.route("/")
 def index():
     """Main page"""
@@ -320,12 +789,12 @@ def get_parties():
     """API endpoint to get all parties"""
     try:
         logger.info("API: Getting parties...")
-        parties = db_manager.get_parties()
-        logger.info(f"API: Returning {len(parties)} parties")
-        return jsonify(parties)
+        # Serialized bytes are cached on PRTMST's mtime, so warm hits do no
+        # parsing or JSON work at all
+        return Response(db_manager.get_parties_json(), mimetype="application/json")
     except Exception as e:
-        logger.error(f"API Error getting parties: {str(e)}")
-        return jsonify([])
+        logger.error("API Error getting parties: %s", e)
+        return ojsonify([])
 
 
 @app.route("/api/test-connection")
@@ -334,13 +803,52 @@ def test_connection():
     try:
         logger.info("API: Testing connection...")
         success = db_manager.test_connection()
-        logger.info(f"API: Connection test result: {success}")
+        logger.info("API: Connection test result: %s", success)
         return jsonify({"success": success})
     except Exception as e:
-        logger.error(f"API Error testing connection: {str(e)}")
+        logger.error("API Error testing connection: %s", e)
         return jsonify({"success": False})
 
 
+@app.route("/api/self-benchmark")
+def self_benchmark():
+    """Measure cold DBF load throughput to guide the worker-class choice.
+
+    Rule of thumb: below ~50 MB/s the disk is the bottleneck and sync
+    worker processes are the better gunicorn choice (set WORKER_CLASS=sync);
+    above it the Python decode dominates and gthread workers overlap fine.
+    """
+    if not HAS_DBFREAD:
+        return ojsonify({"success": False, "error": "dbfread not available"}, 503)
+
+    try:
+        size = os.path.getsize(db_manager.prtmst_path)
+        runs = []
+        for _ in range(2):
+            with _dbf_cache_lock:
+                _dbf_cache.pop(db_manager.prtmst_path, None)
+            started = time.perf_counter()
+            db_manager.get_parties()
+            runs.append(time.perf_counter() - started)
+
+        best = min(runs)
+        bytes_per_second = size / best if best > 0 else 0
+        recommended = "sync" if bytes_per_second < 50 * 1024 * 1024 else "gthread"
+
+        return ojsonify(
+            {
+                "success": True,
+                "file_size_bytes": size,
+                "runs_seconds": [round(r, 6) for r in runs],
+                "bytes_per_second": int(bytes_per_second),
+                "recommended_worker_class": recommended,
+            }
+        )
+    except Exception as e:
+        logger.error("Self-benchmark failed: %s", e)
+        return ojsonify({"success": False, "error": str(e)}, 500)
+
+
 @app.route("/api/dockets")
 def get_dockets_api():
     """API endpoint to get dockets data"""
@@ -356,49 +864,26 @@ def get_dockets_api():
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
 
-        # Get dockets
-        dockets = db_manager.get_dockets(start_date, end_date, party_code)
-
-        # Get parties for mapping
-        parties = db_manager.get_parties()
-        parties_map = {p["code"]: p for p in parties}
-
-        # Enhance dockets with party information
-        enhanced_dockets = []
-        for docket in dockets:
-            party_info = parties_map.get(docket.get("party_code"), {})
-            consignor_name = party_info.get("name", "")
-
-            # Format consignee info
-            consignee_parts = []
-            if party_info.get("name"):
-                consignee_parts.append(party_info["name"])
-            if party_info.get("adr1"):
-                consignee_parts.append(party_info["adr1"])
-            if party_info.get("adr2"):
-                consignee_parts.append(party_info["adr2"])
-            if party_info.get("city"):
-                consignee_parts.append(party_info["city"])
-            if party_info.get("phone"):
-                consignee_parts.append(f"Phone: {party_info['phone']}")
-
-            enhanced_docket = {
-                "docket_no": docket["docket_no"],
-                "date": docket["date"].strftime("%d/%m/%Y"),
-                "origin": docket["origin"],
-                "destination": docket["destination"],
-                "consignor": consignor_name,
-                "consignee": docket.get("party_name", ""),
-                "ref_no": docket["ref_no"],
-                "weight": docket["weight"],
-                "amount": docket["amount"],
-            }
-            enhanced_dockets.append(enhanced_docket)
+        enhanced_dockets = _get_enhanced_dockets(start_date, end_date, party_code)
+
+        # Stream the response row by row instead of materializing the full
+        # JSON string - keeps peak memory flat and improves time to first
+        # byte on large date ranges
+        def generate():
+            yield b'{"success": true, "dockets": ['
+            first = True
+            for docket in enhanced_dockets:
+                if first:
+                    first = False
+                else:
+                    yield b","
+                yield _json_dumps(docket)
+            yield b"]}"
 
-        return jsonify({"success": True, "dockets": enhanced_dockets})
+        return Response(stream_with_context(generate()), mimetype="application/json")
 
     except Exception as e:
-        logger.error(f"Error getting dockets: {str(e)}")
+        logger.error("Error getting dockets: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 
@@ -417,57 +902,27 @@ def courier_slips():
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
 
-        # Get dockets
-        dockets = db_manager.get_dockets(start_date, end_date, party_code)
+        enhanced_dockets = _get_enhanced_dockets(start_date, end_date, party_code)
 
-        if not dockets:
+        if not enhanced_dockets:
             return render_template(
                 "courier_slips.html",
                 dockets=[],
                 message="No dockets found for the selected criteria",
             )
 
-        # Get parties for mapping
-        parties = db_manager.get_parties()
-        parties_map = {p["code"]: p for p in parties}
-
-        # Enhance dockets with party information
-        enhanced_dockets = []
-        for docket in dockets:
-            party_info = parties_map.get(docket.get("party_code"), {})
-            consignor_name = party_info.get("name", "")
-            # Format consignee info
-            consignee_parts = []
-            if party_info.get("name"):
-                consignee_parts.append(party_info["name"])
-            if party_info.get("adr1"):
-                consignee_parts.append(party_info["adr1"])
-            if party_info.get("adr2"):
-                consignee_parts.append(party_info["adr2"])
-            if party_info.get("city"):
-                consignee_parts.append(party_info["city"])
-            if party_info.get("phone"):
-                consignee_parts.append(f"Phone: {party_info['phone']}")
-
-            enhanced_docket = {
-                "docket_no": docket["docket_no"],
-                "date": docket["date"].strftime("%d/%m/%Y"),
-                "origin": docket["origin"],
-                "destination": docket["destination"],
-                "consignor": consignor_name,
-                "consignee": docket.get("party_name", ""),
-                "ref_no": docket["ref_no"],
-                "weight": docket["weight"],
-                "amount": docket["amount"],
-            }
-            enhanced_dockets.append(enhanced_docket)
+        # dd/mm/yyyy slices compare lexicographically as (year, month, day),
+        # so no strptime (and no exception machinery) runs per row
         sorted_dockets = sorted(
-            enhanced_dockets, key=lambda x: datetime.strptime(x["date"], "%d/%m/%Y")
+            enhanced_dockets,
+            key=lambda x: (x.date[6:10], x.date[3:5], x.date[:2]),
         )
-        return render_template("courier_slips.html", dockets=sorted_dockets)
+        # Stream the rendered HTML so the browser starts laying out the
+        # first slips while the rest of the page is still being generated
+        return stream_template("courier_slips.html", dockets=sorted_dockets)
 
     except Exception as e:
-        logger.error(f"Error in courier_slips: {str(e)}")
+        logger.error("Error in courier_slips: %s", e)
         return f"Error: {str(e)}", 500
 
 
@@ -514,7 +969,7 @@ def cli_mode():
     # Party selection
     print(f"\nAvailable parties ({len(parties)}):")
     for i, party in enumerate(parties[:10]):  # Show first 10
-        print(f"{i+1}. {party['name']} ({party['code']})")
+        print(f"{i+1}. {party.name} ({party.code})")
 
     if len(parties) > 10:
         print(f"... and {len(parties) - 10} more parties")
@@ -531,15 +986,15 @@ def cli_mode():
             elif choice.isdigit():
                 idx = int(choice) - 1
                 if 0 <= idx < len(parties):
-                    party_code = parties[idx]["code"]
-                    party_name = parties[idx]["name"]
+                    party_code = parties[idx].code
+                    party_name = parties[idx].name
                     break
             else:
                 # Try to find by code
                 for party in parties:
-                    if party["code"].upper() == choice.upper():
-                        party_code = party["code"]
-                        party_name = party["name"]
+                    if party.code.upper() == choice.upper():
+                        party_code = party.code
+                        party_name = party.name
                         break
                 else:
                     print("Invalid selection.")
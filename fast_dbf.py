@@ -0,0 +1,112 @@
+"""Minimal mmap-backed DBF reader for the fixed-layout tables this app uses.
+
+dbfread decodes every field of every record in pure Python, which is the
+bottleneck when the app only needs a handful of columns. The DBF format is a
+trivial fixed-record layout (32-byte header, 32 bytes per field descriptor,
+then fixed-width records), so this reader computes each field's (offset,
+length) once, mmaps the records region, and slices out only the requested
+columns as raw bytes. Decoding is left to the caller.
+
+Falls back are the caller's job: FastDBF raises UnsupportedDbfError for
+header versions it does not recognize so callers can drop back to dbfread.
+"""
+
+import mmap
+import struct
+
+# Version bytes of dBase/FoxPro variants that use the standard fixed-width
+# record layout (with or without memo files - memo data lives outside the
+# .DBF so record slicing is unaffected)
+_SUPPORTED_VERSIONS = {0x02, 0x03, 0x04, 0x05, 0x30, 0x31, 0x43, 0x83, 0x8B, 0xF5, 0xFB}
+
+_HEADER_SIZE = 32
+_FIELD_DESCRIPTOR_SIZE = 32
+_FIELD_TERMINATOR = 0x0D
+_DELETED_FLAG = 0x2A  # b'*'
+
+
+class UnsupportedDbfError(Exception):
+    """Raised when a DBF header is malformed or of an unrecognized version"""
+
+
+class FastDBF:
+    """Read-only access to a DBF file's raw field bytes via mmap"""
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+            if len(header) < _HEADER_SIZE:
+                raise UnsupportedDbfError(f"{path}: truncated header")
+
+            version = header[0]
+            if version not in _SUPPORTED_VERSIONS:
+                raise UnsupportedDbfError(
+                    f"{path}: unrecognized DBF version 0x{version:02X}"
+                )
+
+            self.numrecords, self.headerlen, self.reclen = struct.unpack_from(
+                "<IHH", header, 4
+            )
+            if self.reclen == 0:
+                raise UnsupportedDbfError(f"{path}: zero record length")
+
+            # Field descriptor array: 32 bytes per field until the 0x0D
+            # terminator. Records start with a 1-byte deletion flag.
+            self.fields = []
+            offset = 1
+            while True:
+                descriptor = f.read(_FIELD_DESCRIPTOR_SIZE)
+                if not descriptor or descriptor[0] == _FIELD_TERMINATOR:
+                    break
+                if len(descriptor) < _FIELD_DESCRIPTOR_SIZE:
+                    raise UnsupportedDbfError(f"{path}: truncated field descriptor")
+                name = descriptor[:11].split(b"\x00", 1)[0].decode("ascii", "replace")
+                field_type = chr(descriptor[11])
+                length = descriptor[16]
+                self.fields.append((name, field_type, offset, length))
+                offset += length
+
+            if not self.fields or offset > self.reclen:
+                raise UnsupportedDbfError(f"{path}: inconsistent field layout")
+
+        self.field_offsets = {
+            name: (field_offset, length)
+            for name, _, field_offset, length in self.fields
+        }
+
+    def field_names(self):
+        return [name for name, _, _, _ in self.fields]
+
+    def records(self, fields=None):
+        """Yield {field name: raw bytes} dicts for the requested fields only.
+
+        Deleted records (flag byte b'*') are skipped, matching dbfread.
+        """
+        if fields is None:
+            fields = self.field_names()
+        wanted = [(name,) + self.field_offsets[name] for name in fields]
+
+        reclen = self.reclen
+        with open(self.path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            # Hint the kernel that we scan front-to-back so it can issue
+            # large readahead requests (no-op on platforms without madvise,
+            # e.g. Windows)
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+                mm.madvise(mmap.MADV_WILLNEED)
+
+            start = self.headerlen
+            # Trust the smaller of the header count and the actual file size
+            # (files sometimes carry a trailing 0x1A EOF byte)
+            end = min(start + self.numrecords * reclen, len(mm) - reclen + 1)
+            for record_offset in range(start, end, reclen):
+                if mm[record_offset] == _DELETED_FLAG:
+                    continue
+                yield {
+                    name: mm[record_offset + field_offset : record_offset + field_offset + length]
+                    for name, field_offset, length in wanted
+                }
@@ -0,0 +1,30 @@
+"""Gunicorn configuration for production deployments.
+
+The Flask dev server in app.py is single-process and meant for local use
+(run_web.bat). On a shared machine, serve the app with:
+
+    gunicorn -c gunicorn_conf.py app:app
+
+Threaded workers let concurrent requests overlap the mmap-backed DBF scans,
+and multiple processes side-step the GIL for the CPU-bound decode work.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+# One process per core by default; DBF parsing is CPU-bound once cached
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count()))
+
+# GET /api/self-benchmark reports measured load throughput and recommends a
+# worker class: "sync" when the disk is the bottleneck, "gthread" when the
+# decode is. Threads only help when reads are fast enough to overlap.
+worker_class = os.environ.get("WORKER_CLASS", "gthread")
+threads = int(os.environ.get("WEB_THREADS", 4))
+
+# Keep connections open between the fetch-dockets / print-slips round trips
+keepalive = 5
+
+accesslog = os.environ.get("ACCESS_LOG") or None
+errorlog = "-"